@@ -1,23 +1,21 @@
 from __future__ import annotations
 
 import asyncio
-import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
 from pathlib import Path
 from typing import List, Optional
 
+import orjson
 import typer
 import httpx
 
 from .config.defaults import load_defaults
 from .ingest.catalog import DebateRecord, fetch_latest_records
 from .ingest.downloader import DebateDownloader
+from .ingest.http import RateLimiter, create_client
 from .ingest.store import DebateMetadataStore
-from .processing.pipeline import ProcessingPipeline
-from .processing.text_extraction import PageBlock
-from .processing.translation import TranslationService
-from .topics.modeling import TopicModel
-from .utils.io import ensure_directory
+from .utils.io import ensure_directory, write_json_array
 from .utils.logging import configure_logging, get_logger
 
 app = typer.Typer(help="Parliament debate summarisation toolkit.")
@@ -53,9 +51,11 @@ def scrape(
     configure_logging(cfg.runtime.logs_dir)
     ensure_directory(Path(cfg.runtime.raw_dir))
 
-    async def _run():
+    async def _scrape(client: httpx.AsyncClient, limiter: RateLimiter) -> None:
         try:
-            records = await fetch_latest_records(cfg.scraper, limit=limit)
+            records = await fetch_latest_records(
+                cfg.scraper, limit=limit, client=client, limiter=limiter
+            )
         except httpx.HTTPError as exc:
             logger.error("Network error while fetching listings: %s", exc)
             typer.echo("Failed to reach eParliament portal. Please check network/SSL settings.")
@@ -71,14 +71,13 @@ def scrape(
 
         ensure_directory(Path(cfg.runtime.data_root))
         metadata_path = Path(cfg.runtime.data_root) / "metadata.json"
-        metadata = [asdict(record) for record in records]
-        metadata_path.write_text(json.dumps(metadata, ensure_ascii=False, indent=2), encoding="utf-8")
+        write_json_array(metadata_path, (asdict(record) for record in records))
         typer.echo(f"Wrote metadata for {len(records)} debates to {metadata_path}")
 
         store = DebateMetadataStore(cfg.runtime)
+        store.upsert_many(records)
         to_download: List[DebateRecord] = []
         for record in records:
-            store.upsert(record)
             existing = store.get(record.url)
             if not existing or not existing.get("downloaded_path"):
                 to_download.append(record)
@@ -94,10 +93,24 @@ def scrape(
 
         typer.echo(f"Downloading {len(to_download)} new PDFs...")
 
-        async with DebateDownloader(cfg.runtime, cfg.scraper) as downloader:
+        async with DebateDownloader(
+            cfg.runtime, cfg.scraper, client=client, limiter=limiter
+        ) as downloader:
             paths = await downloader.bulk_download(to_download)
-            for record, path in zip(to_download, paths):
-                store.upsert(record, downloaded_path=str(path))
+        downloaded = [(record, path) for record, path in zip(to_download, paths) if path is not None]
+        if downloaded:
+            store.upsert_many(
+                [record for record, _ in downloaded],
+                downloaded_paths=[str(path) for _, path in downloaded],
+            )
+        failed = len(to_download) - len(downloaded)
+        if failed:
+            typer.echo(f"{failed} PDFs failed to download; see logs for details.")
+
+    async def _run():
+        # One client and limiter for listing and PDF requests to the same host.
+        async with create_client(cfg.scraper) as client:
+            await _scrape(client, RateLimiter(cfg.scraper.request_interval_seconds))
 
     loop = get_event_loop()
     loop.run_until_complete(_run())
@@ -106,6 +119,10 @@ def scrape(
 @app.command()
 def process(pdf: Optional[Path] = typer.Option(None, help="Specific PDF to process.")) -> None:
     """Run text extraction + summarisation for downloaded PDFs."""
+    # Imported here: torch/transformers are slow to load, and OCR workers spawned by the
+    # pipeline re-import this module.
+    from .processing.pipeline import ProcessingPipeline
+
     cfg = load_defaults()
     configure_logging(cfg.runtime.logs_dir)
     ensure_directory(Path(cfg.runtime.processed_dir))
@@ -121,17 +138,21 @@ def process(pdf: Optional[Path] = typer.Option(None, help="Specific PDF to proce
         typer.echo("No PDFs found. Run the scrape command first or specify --pdf.")
         raise typer.Exit(code=1)
 
-    async def _run():
-        for path in targets:
-            await pipeline.process_pdf(path)
-
     loop = get_event_loop()
-    loop.run_until_complete(_run())
+    loop.run_until_complete(pipeline.process_many(targets))
+
+
+def _load_document_text(json_path: Path) -> str:
+    payload = orjson.loads(json_path.read_bytes())
+    pages = payload.get("pages", [])
+    return "\n".join(page.get("text", "") for page in pages).strip()
 
 
 @app.command()
 def topics(source: Optional[Path] = typer.Option(None, help="Directory of processed JSON files.")) -> None:
     """Generate topic clusters from processed English documents."""
+    from .topics.modeling import TopicModel
+
     cfg = load_defaults()
     configure_logging(cfg.runtime.logs_dir)
 
@@ -141,19 +162,15 @@ def topics(source: Optional[Path] = typer.Option(None, help="Directory of proces
         typer.echo(f"Topic source directory {base} does not exist.")
         raise typer.Exit(code=1)
 
-    documents = []
-    for json_path in sorted(base.glob("*.json")):
-        payload = json.loads(json_path.read_text(encoding="utf-8"))
-        pages = payload.get("pages", [])
-        text = "\n".join(page.get("text", "") for page in pages)
-        documents.append(text.strip())
-
-    documents = [doc for doc in documents if doc]
+    paths = sorted(base.glob("*.json"))
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        documents = [doc for doc in executor.map(_load_document_text, paths) if doc]
     if not documents:
         typer.echo("No processed summaries found.")
         raise typer.Exit(code=1)
 
-    topic_model = TopicModel(cfg.topics)
+    cache_dir = Path(cfg.runtime.cache_dir).expanduser() / "topics"
+    topic_model = TopicModel(cfg.topics, cache_dir=cache_dir)
     assignments = topic_model.fit(documents)
 
     output_path = Path(cfg.runtime.data_root) / "topics.json"
@@ -161,7 +178,7 @@ def topics(source: Optional[Path] = typer.Option(None, help="Directory of proces
         {"topic_id": assignment.topic_id, "label": assignment.label, "sentences": assignment.sentences}
         for assignment in assignments
     ]
-    output_path.write_text(json.dumps(serialisable, ensure_ascii=False, indent=2), encoding="utf-8")
+    output_path.write_bytes(orjson.dumps(serialisable, option=orjson.OPT_INDENT_2))
     typer.echo(f"Wrote topic assignments to {output_path}")
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
@@ -7,11 +8,24 @@ import yaml
 
 from .models import AppConfig
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # pragma: no cover - libyaml not available
+    from yaml import SafeLoader as _Loader
+
 DEFAULTS_PATH = Path(__file__).with_suffix(".yaml")
 
 
-def load_defaults() -> AppConfig:
-    """Load configuration defaults from the bundled YAML file."""
+@lru_cache(maxsize=1)
+def _load_validated() -> AppConfig:
     with DEFAULTS_PATH.open("r", encoding="utf-8") as fh:
-        data: Dict[str, Any] = yaml.safe_load(fh)
+        data: Dict[str, Any] = yaml.load(fh, Loader=_Loader)
     return AppConfig.model_validate(data)
+
+
+def load_defaults() -> AppConfig:
+    """Load configuration defaults from the bundled YAML file.
+
+    The parsed config is cached; callers receive a copy they are free to mutate.
+    """
+    return _load_validated().model_copy(deep=True)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -24,16 +24,31 @@ class ScraperSettings(BaseModel):
     max_retries: int = 4
     timeout_seconds: int = 30
     years_back: int = 5
+    max_concurrency: int = 6
+    prefetch_pages: int = Field(4, gt=0)
 
 
 class ProcessingSettings(BaseModel):
     batch_size: int = 2
     max_pages: Optional[int] = None
     enable_ocr: bool = True
-    ocr_dpi: int = 300
+    min_chars_for_text_layer: int = 50
+    ocr_dpi: int = 200
     ocr_languages: str = "eng+hin"
+    ocr_psm: int = 6
+    ocr_oem: int = 1
+    ocr_workers: Optional[int] = Field(None, gt=0)
     language_detection: str = "fasttext"
+    language_model_path: str = "./models/lid.176.ftz"
     translation_model: str = "ai4bharat/indictrans2-hi-en"
+    translation_batch_size: int = Field(8, gt=0)
+    translation_cache_size: int = 4096
+    translation_dtype: Literal["auto", "float32", "float16", "bfloat16"] = "auto"
+    translation_compile: bool = False
+    translation_quantize: bool = False
+    translation_backend: str = "transformers"
+    translation_ct2_model: Optional[str] = None
+    translation_onnx_model: Optional[str] = None
     summarisation_model: str = "google/pegasus-xsum"
     max_summary_tokens: int = 256
     device_preference: str = "mps"
@@ -1,17 +1,41 @@
 from __future__ import annotations
 
+import asyncio
+from collections import deque
+from contextlib import aclosing, suppress
 from dataclasses import dataclass
-from typing import AsyncIterator, List, Optional
+from datetime import datetime
+from functools import lru_cache
+from typing import AsyncIterator, Deque, List, Optional, Tuple
 
 import httpx
 import pendulum
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 
 from ..config.models import ScraperSettings
 from ..utils.logging import get_logger
+from .http import RateLimiter, create_client
 
 logger = get_logger(__name__)
 
+_VIEW_MARKER = "?view_type=browse"
+_PORTAL_DATE_FORMATS = ("%d-%m-%Y", "%Y-%m-%d")
+
+
+@lru_cache(maxsize=1024)
+def _parse_date_cached(value: str) -> Optional[pendulum.Date]:
+    # Debates on the same sitting share a date string, and pendulum.parse is slow.
+    for fmt in _PORTAL_DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return pendulum.date(parsed.year, parsed.month, parsed.day)
+    try:
+        return pendulum.parse(value, strict=False).date()
+    except Exception:
+        return None
+
 
 @dataclass
 class DebateRecord:
@@ -27,27 +51,32 @@ class DebateRecord:
 class DebateCatalog:
     """Scrape debate metadata from the eParliament portal."""
 
-    def __init__(self, settings: ScraperSettings) -> None:
+    def __init__(
+        self,
+        settings: ScraperSettings,
+        client: Optional[httpx.AsyncClient] = None,
+        limiter: Optional[RateLimiter] = None,
+    ) -> None:
         self.settings = settings
-        self._client = httpx.AsyncClient(
-            base_url=settings.base_url,
-            headers={"User-Agent": settings.user_agent},
-            timeout=settings.timeout_seconds,
-        )
+        self._owns_client = client is None
+        self._client = client or create_client(settings)
+        self._limiter = limiter or RateLimiter(settings.request_interval_seconds)
         self._page_size = 20
+        self._prefetch = max(1, settings.prefetch_pages)
         self._cutoff_date = None
         if settings.years_back and settings.years_back > 0:
             self._cutoff_date = pendulum.now("UTC").subtract(years=settings.years_back).date()
 
     async def _fetch_page(self, offset: int) -> List[DebateRecord]:
         path = f"{self.settings.handle_path}?offset={offset}"
+        await self._limiter.acquire()
         response = await self._client.get(path)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+        tree = LexborHTMLParser(response.text)
 
-        rows = soup.select("table tbody tr")
+        rows = tree.css("table tbody tr")
         if not rows:
-            rows = soup.select("tr")
+            rows = tree.css("tr")
 
         records: List[DebateRecord] = []
         if not rows:
@@ -63,8 +92,8 @@ class DebateCatalog:
             logger.warning("Parsed zero debate records from offset %s", offset)
         return records
 
-    def _parse_row(self, row) -> Optional[DebateRecord]:
-        links = row.select("a[href]")
+    def _parse_row(self, row: LexborNode) -> Optional[DebateRecord]:
+        links = row.css("a[href]")
         if not links:
             return None
 
@@ -72,11 +101,11 @@ class DebateCatalog:
         title_text: Optional[str] = None
 
         for link in links:
-            href = link.get("href", "").strip()
+            href = (link.attributes.get("href") or "").strip()
             if not href:
                 continue
-            text = link.get_text(strip=True)
-            if "?view_type=browse" in href or (text and text.lower().startswith("view")):
+            text = link.text(strip=True)
+            if _VIEW_MARKER in href or (len(text) >= 4 and text[:4].lower() == "view"):
                 detail_href = href.split("?")[0]
             elif href.startswith("/handle/") and not href.endswith(".pdf"):
                 if not title_text:
@@ -87,7 +116,7 @@ class DebateCatalog:
         if not detail_href:
             return None
 
-        cells = [cell.get_text(strip=True) for cell in row.find_all("td")]
+        cells = [cell.text(strip=True) for cell in row.css("td")]
         date = cells[0] if cells else "Unknown"
 
         session: Optional[str] = None
@@ -107,39 +136,98 @@ class DebateCatalog:
     def _parse_date(self, value: str) -> Optional[pendulum.Date]:
         if not value or value.lower() == "unknown":
             return None
+        return _parse_date_cached(value)
+
+    async def _page_producer(
+        self, queue: asyncio.Queue, stop: asyncio.Event, limit: int = 0
+    ) -> None:
+        """Fetch listing pages ahead of the consumer, pushing them onto `queue` in order.
+
+        Up to `prefetch_pages` requests are in flight; each page is queued as soon as it
+        and the pages before it have arrived. With a `limit`, no page is requested beyond
+        what the records seen so far leave outstanding. A `None` sentinel marks the end.
+        """
+        window: Deque[Tuple[int, asyncio.Task]] = deque()
+        next_offset = 0
+        queued_records = 0
+
+        def wanted() -> bool:
+            if stop.is_set():
+                return False
+            if limit <= 0:
+                return True
+            return queued_records + len(window) * self._page_size < limit
+
         try:
-            return pendulum.parse(value, strict=False).date()
+            while True:
+                while len(window) < self._prefetch and wanted():
+                    window.append((next_offset, asyncio.create_task(self._fetch_page(next_offset))))
+                    next_offset += self._page_size
+                if not window:
+                    break
+                page_offset, task = window.popleft()
+                try:
+                    page = await task
+                except httpx.HTTPError as exc:
+                    logger.error("Failed to fetch listing at offset {}: {}", page_offset, exc)
+                    break
+                if not page:
+                    break
+                await queue.put(page)
+                queued_records += len(page)
         except Exception:
-            return None
-
-    async def iter_records(self) -> AsyncIterator[DebateRecord]:
-        """Iterate over debate records within the configured time window."""
-        offset = 0
-        while True:
-            try:
-                page_records = await self._fetch_page(offset)
-            except httpx.HTTPError as exc:
-                logger.error("Failed to fetch listing at offset %s: %s", offset, exc)
-                break
-
-            if not page_records:
-                break
-
-            stop = False
-            for record in page_records:
-                if self._cutoff_date:
-                    parsed_date = self._parse_date(record.date)
-                    if parsed_date and parsed_date < self._cutoff_date:
-                        stop = True
-                        break
-                yield record
-
-            offset += self._page_size
-            if stop:
-                break
+            await queue.put(None)
+            raise
+        finally:
+            for _, task in window:
+                if task.done():
+                    if not task.cancelled():
+                        # Already-finished fetches past the end; retrieve so errors are not reported.
+                        task.exception()
+                else:
+                    task.cancel()
+        await queue.put(None)
+
+    async def iter_records(self, limit: int = 0) -> AsyncIterator[DebateRecord]:
+        """Iterate over debate records within the configured time window.
+
+        `limit` only bounds how far ahead listing pages are fetched; callers still stop
+        iterating themselves. Callers that may stop early must close the generator
+        (e.g. `async with contextlib.aclosing(catalog.iter_records()) as records:`) before
+        the catalog is closed, so background page fetches are cancelled while the client
+        is still open.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._prefetch)
+        stop = asyncio.Event()
+        producer = asyncio.create_task(self._page_producer(queue, stop, limit))
+        try:
+            while True:
+                page_records = await queue.get()
+                if page_records is None:
+                    # Surface any unexpected producer failure.
+                    await producer
+                    break
+
+                for record in page_records:
+                    if self._cutoff_date:
+                        parsed_date = self._parse_date(record.date)
+                        if parsed_date and parsed_date < self._cutoff_date:
+                            stop.set()
+                            break
+                    yield record
+
+                if stop.is_set():
+                    break
+        finally:
+            stop.set()
+            if not producer.done():
+                producer.cancel()
+                with suppress(asyncio.CancelledError):
+                    await producer
 
     async def close(self) -> None:
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
 
     async def __aenter__(self) -> "DebateCatalog":
         return self
@@ -148,12 +236,18 @@ class DebateCatalog:
         await self.close()
 
 
-async def fetch_latest_records(settings: ScraperSettings, limit: int = 5) -> List[DebateRecord]:
+async def fetch_latest_records(
+    settings: ScraperSettings,
+    limit: int = 5,
+    client: Optional[httpx.AsyncClient] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> List[DebateRecord]:
     """Convenience helper returning the most recent debate records."""
-    async with DebateCatalog(settings) as catalog:
+    async with DebateCatalog(settings, client=client, limiter=limiter) as catalog:
         results: List[DebateRecord] = []
-        async for record in catalog.iter_records():
-            results.append(record)
-            if limit and limit > 0 and len(results) >= limit:
-                break
+        async with aclosing(catalog.iter_records(limit=limit or 0)) as records:
+            async for record in records:
+                results.append(record)
+                if limit and limit > 0 and len(results) >= limit:
+                    break
     return results
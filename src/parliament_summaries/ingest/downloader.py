@@ -1,66 +1,85 @@
 from __future__ import annotations
 
 import asyncio
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, List, Optional
 from urllib.parse import urlparse
 
+import aiofiles
 import httpx
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 
 from ..config.models import RuntimeSettings, ScraperSettings
 from ..utils.io import ensure_directory
 from ..utils.logging import get_logger
 from .catalog import DebateRecord
+from .http import RateLimiter, create_client
 
 logger = get_logger(__name__)
 
+# Anchors repeat heavily across debate pages, so memoise URL parsing.
+_PARSE = lru_cache(maxsize=4096)(urlparse)
+_INTERNAL_PREFIX = ("10.",)
+_FILENAME_TRANS = str.maketrans({"/": "-", " ": "_", ":": "-", "\\": "-", "\t": "_"})
+# Leave room for the ".pdf" suffix within the common 255-byte NAME_MAX.
+_MAX_FILENAME_BYTES = 240
+
 
 class DebateDownloader:
     """Download debate PDFs and persist metadata locally."""
 
-    def __init__(self, runtime: RuntimeSettings, scraper: ScraperSettings) -> None:
+    def __init__(
+        self,
+        runtime: RuntimeSettings,
+        scraper: ScraperSettings,
+        client: Optional[httpx.AsyncClient] = None,
+        limiter: Optional[RateLimiter] = None,
+    ) -> None:
         self.runtime = runtime
         self.scraper = scraper
         ensure_directory(Path(runtime.raw_dir))
-        self._client = httpx.AsyncClient(
-            headers={"User-Agent": scraper.user_agent},
-            timeout=scraper.timeout_seconds,
-        )
+        self._owns_client = client is None
+        self._client = client or create_client(scraper)
+        self._limiter = limiter or RateLimiter(scraper.request_interval_seconds)
+        self._sem = asyncio.Semaphore(scraper.max_concurrency or 6)
+        self._base_url = httpx.URL(scraper.base_url)
 
     async def resolve_pdf_url(self, record: DebateRecord) -> Optional[str]:
         """Fetch the debate page and extract the PDF link."""
         page_url = httpx.URL(self.scraper.base_url + record.url)
+        await self._limiter.acquire()
         response = await self._client.get(page_url)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        tree = LexborHTMLParser(response.text)
 
-        meta_pdf = soup.find("meta", attrs={"name": "citation_pdf_url"})
-        if meta_pdf and meta_pdf.get("content"):
-            return self._normalise_pdf_url(meta_pdf["content"], page_url)
+        meta_pdf = tree.css_first('meta[name="citation_pdf_url"]')
+        content = meta_pdf.attributes.get("content") if meta_pdf is not None else None
+        if content:
+            return self._normalise_pdf_url(content, page_url)
 
-        for anchor in soup.select("a[href$='.pdf']"):
-            href = anchor.get("href", "")
+        for anchor in tree.css("a[href$='.pdf']"):
+            href = anchor.attributes.get("href") or ""
             if href:
                 return self._normalise_pdf_url(href, page_url)
         return None
 
     def _normalise_pdf_url(self, href: str, page_url: httpx.URL) -> str:
         """Convert hrefs (relative, internal IP, or http) to public HTTPS URL."""
-        parsed = urlparse(href)
+        parsed = _PARSE(href)
 
         if not parsed.netloc:
             return str(page_url.join(href))
 
         # Handle internal IP hosts by replacing with public base.
-        if parsed.hostname and parsed.hostname.startswith("10."):
-            base = httpx.URL(self.scraper.base_url)
+        if parsed.hostname and parsed.hostname.startswith(_INTERNAL_PREFIX):
             relative = parsed.path.lstrip("/")
             if parsed.query:
                 relative = f"{relative}?{parsed.query}"
-            joined = base.join(relative)
+            joined = self._base_url.join(relative)
             return str(joined)
 
         # Ensure HTTPS for http links.
@@ -76,11 +95,27 @@ class DebateDownloader:
         reraise=True,
     )
     async def _download_once(self, pdf_url: str, target_path: Path) -> None:
-        async with self._client.stream("GET", pdf_url) as response:
-            response.raise_for_status()
-            with target_path.open("wb") as fh:
-                async for chunk in response.aiter_bytes():
-                    fh.write(chunk)
+        # Stream into a sibling ".part" file so an interrupted download never looks complete.
+        part_path = target_path.with_suffix(".pdf.part")
+        await self._limiter.acquire()
+        try:
+            async with self._client.stream("GET", pdf_url) as response:
+                response.raise_for_status()
+                async with aiofiles.open(part_path, "wb") as fh:
+                    length = response.headers.get("Content-Length", "")
+                    # Reserve the extent up front; skip when the body is decoded to a different size.
+                    if (
+                        length.isdigit()
+                        and "Content-Encoding" not in response.headers
+                        and hasattr(os, "posix_fallocate")
+                    ):
+                        await asyncio.to_thread(os.posix_fallocate, fh.fileno(), 0, int(length))
+                    async for chunk in response.aiter_bytes():
+                        await fh.write(chunk)
+            os.replace(part_path, target_path)
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
 
     async def download_record(self, record: DebateRecord) -> Path:
         """Download a single debate PDF, returning resulting path."""
@@ -88,12 +123,9 @@ class DebateDownloader:
         if not pdf_url:
             raise ValueError(f"Could not locate PDF for debate {record.url}")
 
-        filename = (
-            f"{record.date}_{record.title}"
-            .replace("/", "-")
-            .replace(" ", "_")
-            .replace(":", "-")
-        )
+        filename = f"{record.date}_{record.title}".translate(_FILENAME_TRANS)
+        # Titles are often Devanagari (3 bytes per character), so cap by encoded length.
+        filename = filename.encode("utf-8")[:_MAX_FILENAME_BYTES].decode("utf-8", "ignore")
         target_path = Path(self.runtime.raw_dir) / f"{filename}.pdf"
 
         if target_path.exists():
@@ -102,18 +134,38 @@ class DebateDownloader:
 
         logger.info("Downloading %s -> %s", pdf_url, target_path)
         await self._download_once(pdf_url, target_path)
-        await asyncio.sleep(self.scraper.request_interval_seconds)
         return target_path
 
-    async def bulk_download(self, records: Iterable[DebateRecord]) -> list[Path]:
-        results: list[Path] = []
-        for record in records:
-            path = await self.download_record(record)
-            results.append(path)
-        return results
+    async def _guarded(self, record: DebateRecord) -> Path:
+        async with self._sem:
+            return await self.download_record(record)
+
+    async def bulk_download(self, records: Iterable[DebateRecord]) -> List[Optional[Path]]:
+        """Download records concurrently, returning paths in input order.
+
+        A record that fails is logged and yields `None`; it does not cancel the others.
+        """
+        records = list(records)
+        tasks = [asyncio.create_task(self._guarded(record)) for record in records]
+        try:
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        paths: List[Optional[Path]] = []
+        for record, outcome in zip(records, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error("Failed to download {}: {}", record.url, outcome)
+                paths.append(None)
+            else:
+                paths.append(outcome)
+        return paths
 
     async def close(self) -> None:
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
 
     async def __aenter__(self) -> "DebateDownloader":
         return self
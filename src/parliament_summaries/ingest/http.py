@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from ..config.models import ScraperSettings
+
+
+class RateLimiter:
+    """Space out requests so that at most one starts per `interval` seconds.
+
+    The limiter is shared between concurrent tasks, keeping politeness towards the
+    portal global rather than per-task.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = max(interval, 0.0)
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            wait = self._next_slot - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_slot = max(now, self._next_slot) + self.interval
+
+
+def create_client(settings: ScraperSettings) -> httpx.AsyncClient:
+    """Build an HTTP/2 client with a connection pool sized for concurrent fetches."""
+    return httpx.AsyncClient(
+        base_url=settings.base_url,
+        headers={"User-Agent": settings.user_agent},
+        timeout=settings.timeout_seconds,
+        http2=True,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    )
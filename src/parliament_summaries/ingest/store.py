@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, List, Optional, Sequence
 
 import sqlite_utils
 from sqlite_utils.db import NotFoundError
@@ -31,6 +31,8 @@ class DebateMetadataStore:
         self._prepare()
 
     def _prepare(self) -> None:
+        self.db.conn.execute("PRAGMA journal_mode=WAL")
+        self.db.conn.execute("PRAGMA synchronous=NORMAL")
         if self.TABLE_NAME in self.db.table_names():
             return
         logger.info("Initialising metadata database at %s", self.db_path)
@@ -69,6 +71,36 @@ class DebateMetadataStore:
         }
         self.db[self.TABLE_NAME].upsert(payload, pk="url")
 
+    def upsert_many(
+        self,
+        records: Sequence[DebateRecord],
+        downloaded_paths: Optional[Sequence[Optional[str]]] = None,
+    ) -> None:
+        """Upsert several records in a single transaction.
+
+        Columns omitted from the payload keep their stored values, so existing
+        download/processing paths survive unless `downloaded_paths` is given.
+        """
+        now = _utc_now()
+        payloads: List[dict] = [
+            {
+                "url": record.url,
+                "title": record.title,
+                "date": record.date,
+                "session": record.session,
+                "pdf_url": record.pdf_url,
+                "last_updated": now,
+            }
+            for record in records
+        ]
+        if downloaded_paths is not None:
+            for payload, path in zip(payloads, downloaded_paths):
+                payload["downloaded_path"] = path
+        if not payloads:
+            return
+        with self.db.conn:
+            self.db[self.TABLE_NAME].upsert_all(payloads, pk="url")
+
     def mark_processed(self, url: str, processed_path: str) -> None:
         self.db[self.TABLE_NAME].update(
             url,
@@ -1,6 +1,22 @@
-"""Document processing pipeline components."""
+"""Document processing pipeline components.
 
-from .pipeline import ProcessingPipeline
-from .text_extraction import DocumentExtraction, TextExtractor
+Exports are resolved lazily: OCR pool workers import modules from this package, and must
+not pay for the translation stack (torch, transformers) that the pipeline pulls in.
+"""
+
+from importlib import import_module
+from typing import Any
 
 __all__ = ["ProcessingPipeline", "DocumentExtraction", "TextExtractor"]
+
+_EXPORTS = {
+    "ProcessingPipeline": ".pipeline",
+    "DocumentExtraction": ".text_extraction",
+    "TextExtractor": ".text_extraction",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name], __name__), name)
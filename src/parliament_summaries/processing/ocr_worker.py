@@ -0,0 +1,95 @@
+"""Tesseract OCR work run inside the extractor's process pool.
+
+Pool workers import this module on their own (forkserver/spawn), so it must stay a leaf:
+only tesserocr, pypdfium2 and logging, never the translation or topic stacks.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import pypdfium2 as pdfium
+import tesserocr
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Per-process OCR state, populated by `init_ocr_worker` inside pool workers.
+_WORKER_API: Optional[tesserocr.PyTessBaseAPI] = None
+_WORKER_DOCUMENT: Optional[Tuple[str, pdfium.PdfDocument]] = None
+
+
+def init_ocr_worker(languages: str, psm: int, oem: int) -> None:
+    """Load Tesseract language data once per worker process.
+
+    Never raises: a worker without usable language data leaves `_WORKER_API` unset and
+    returns empty text, rather than breaking the whole pool.
+    """
+    global _WORKER_API
+    try:
+        _WORKER_API = tesserocr.PyTessBaseAPI(lang=languages, psm=psm, oem=oem)
+        return
+    except RuntimeError as exc:
+        if "hin" not in languages:
+            logger.error("Failed loading OCR languages {}: {}; OCR disabled", languages, exc)
+            return
+        logger.error("Failed loading OCR languages {}: {}; falling back to English", languages, exc)
+    try:
+        _WORKER_API = tesserocr.PyTessBaseAPI(lang="eng", psm=psm, oem=oem)
+    except RuntimeError as exc:
+        logger.error("Failed loading English OCR data: {}; OCR disabled", exc)
+
+
+def _worker_document(pdf_path: str) -> pdfium.PdfDocument:
+    """Return this worker's handle for `pdf_path`; pdfium handles cannot cross processes."""
+    global _WORKER_DOCUMENT
+    if _WORKER_DOCUMENT is None or _WORKER_DOCUMENT[0] != pdf_path:
+        if _WORKER_DOCUMENT is not None:
+            _WORKER_DOCUMENT[1].close()
+        _WORKER_DOCUMENT = (pdf_path, pdfium.PdfDocument(pdf_path))
+    return _WORKER_DOCUMENT[1]
+
+
+def _run_ocr(bitmap: pdfium.PdfBitmap, pdf_path: str, page_number: int) -> str:
+    if _WORKER_API is None:
+        return ""
+    text = ""
+    try:
+        # Hand pdfium's buffer straight to Tesseract instead of going through PIL.
+        _WORKER_API.SetImageBytes(
+            bytes(bitmap.buffer),
+            bitmap.width,
+            bitmap.height,
+            bitmap.n_channels,
+            bitmap.stride,
+        )
+        text = _WORKER_API.GetUTF8Text()
+    except RuntimeError as exc:
+        logger.error("OCR failed on {} page {}: {}", pdf_path, page_number, exc)
+        text = ""
+
+    return text.replace("\x0c", "").strip()
+
+
+def render_and_ocr(task: Tuple[str, int, float]) -> Optional[str]:
+    """Render and OCR a single page inside a pool worker; `None` marks a skipped page."""
+    pdf_path, index, scale = task
+    page_number = index + 1
+    try:
+        page = _worker_document(pdf_path).get_page(index)
+    except Exception as exc:
+        logger.error("Unable to access page {} of {}: {}", page_number, pdf_path, exc)
+        return None
+
+    try:
+        bitmap = page.render(scale=scale, grayscale=True)
+    except Exception as exc:
+        logger.error("Rendering failed for {} page {}: {}", pdf_path, page_number, exc)
+        page.close()
+        return None
+
+    text = _run_ocr(bitmap, pdf_path, page_number)
+    bitmap.close()
+    page.close()
+    return text
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import asyncio
-import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable, List, Optional
+
+import orjson
 
 from ..config.models import ProcessingSettings, RuntimeSettings
 from ..utils.io import ensure_directory
@@ -13,6 +15,8 @@ from .translation import TranslationService, TranslatedBlock
 
 logger = get_logger(__name__)
 
+INLINE_WRITE_LIMIT = 64 * 1024
+
 
 class ProcessingPipeline:
     """Orchestrates PDF extraction and bilingual JSON generation."""
@@ -27,22 +31,85 @@ class ProcessingPipeline:
 
         self.extractor = TextExtractor(settings)
         self.translator = TranslationService(settings)
+        self._extract_pool: Optional[ThreadPoolExecutor] = None
 
     async def _extract(self, pdf_path: Path) -> DocumentExtraction:
-        return await asyncio.to_thread(self.extractor.extract, pdf_path)
+        if self._extract_pool is None:
+            self._extract_pool = ThreadPoolExecutor(
+                max_workers=max(1, self.settings.batch_size), thread_name_prefix="extract"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._extract_pool, self.extractor.extract, pdf_path)
+
+    def close(self) -> None:
+        """Release extraction threads and OCR workers; they are recreated on next use."""
+        if self._extract_pool is not None:
+            self._extract_pool.shutdown(wait=True)
+            self._extract_pool = None
+        self.extractor.close()
 
     async def _translate(self, extraction: DocumentExtraction) -> Dict[int, TranslatedBlock]:
         translated_blocks = await asyncio.to_thread(self.translator.translate_blocks, extraction.blocks)
         return {block.page_number: block for block in translated_blocks}
 
     async def _write_json(self, path: Path, payload: Dict) -> None:
-        text = json.dumps(payload, ensure_ascii=False, indent=2)
-        await asyncio.to_thread(path.write_text, text, "utf-8")
+        data = orjson.dumps(payload)
+        # A thread hop costs more than writing a small file directly.
+        if len(data) < INLINE_WRITE_LIMIT:
+            path.write_bytes(data)
+        else:
+            await asyncio.to_thread(path.write_bytes, data)
 
     async def process_pdf(self, pdf_path: Path) -> Dict[str, Path]:
         extraction = await self._extract(pdf_path)
         translated_map = await self._translate(extraction)
-
+        return await self._write_outputs(pdf_path, extraction, translated_map)
+
+    async def process_many(self, pdf_paths: Iterable[Path]) -> List[Dict[str, Path]]:
+        """Process PDFs with extraction, translation, and writing overlapped across documents.
+
+        Up to `batch_size` documents are extracted concurrently while the translator works
+        through earlier ones; bounded queues keep at most a couple of documents in flight
+        between stages.
+        """
+        pending = iter(pdf_paths)
+        extracted: asyncio.Queue = asyncio.Queue(maxsize=2)
+        translated: asyncio.Queue = asyncio.Queue(maxsize=2)
+        outputs: List[Dict[str, Path]] = []
+
+        async def _extractor() -> None:
+            for path in pending:
+                await extracted.put((path, await self._extract(path)))
+
+        async def _extractors() -> None:
+            await asyncio.gather(*(_extractor() for _ in range(max(1, self.settings.batch_size))))
+            await extracted.put(None)
+
+        async def _translator() -> None:
+            while (item := await extracted.get()) is not None:
+                path, extraction = item
+                await translated.put((path, extraction, await self._translate(extraction)))
+            await translated.put(None)
+
+        async def _writer() -> None:
+            while (item := await translated.get()) is not None:
+                outputs.append(await self._write_outputs(*item))
+
+        tasks = [asyncio.create_task(stage()) for stage in (_extractors, _translator, _writer)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.to_thread(self.close)
+        return outputs
+
+    async def _write_outputs(
+        self,
+        pdf_path: Path,
+        extraction: DocumentExtraction,
+        translated_map: Dict[int, TranslatedBlock],
+    ) -> Dict[str, Path]:
         original_payload = {
             "source_pdf": pdf_path.name,
             "pages": [
@@ -74,10 +141,8 @@ class ProcessingPipeline:
         original_path = self._original_dir / f"{pdf_path.stem}.json"
         translated_path = self._translated_dir / f"{pdf_path.stem}.json"
 
-        await asyncio.gather(
-            self._write_json(original_path, original_payload),
-            self._write_json(translated_path, translated_payload),
-        )
+        await self._write_json(original_path, original_payload)
+        await self._write_json(translated_path, translated_payload)
 
         logger.info("Wrote processed outputs %s and %s", original_path, translated_path)
         return {"original": original_path, "english": translated_path}
@@ -1,20 +1,30 @@
 from __future__ import annotations
 
 import json
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Sequence, Tuple
 
+import fasttext
 import pdfplumber
 import pypdfium2 as pdfium
-import pytesseract
 from langdetect import detect_langs
 
 from ..config.models import ProcessingSettings
 from ..utils.logging import get_logger
+from .ocr_worker import init_ocr_worker, render_and_ocr
 
 logger = get_logger(__name__)
 
+_DEVANAGARI_RE = re.compile(r"[\u0900-\u097F]")
+_SCRIPT_SAMPLE_CHARS = 2048
+_DEVANAGARI_SHARE = 0.3
+
 
 @dataclass
 class PageBlock:
@@ -41,14 +51,34 @@ class DocumentExtraction:
         )
 
 
+def _script_language(text: str) -> Optional[str]:
+    """Classify clearly mono-script text without a model; `None` means mixed content."""
+    sample = text[:_SCRIPT_SAMPLE_CHARS]
+    if sample.isascii():
+        return "en"
+    if len(_DEVANAGARI_RE.findall(sample)) > _DEVANAGARI_SHARE * len(sample):
+        return "hi"
+    return None
+
+
 class TextExtractor:
     """Extract page-wise text using OCR (via pypdfium2) or native PDF text."""
 
     def __init__(self, settings: ProcessingSettings) -> None:
         self.settings = settings
         self.ocr_languages = settings.ocr_languages or "eng+hin"
-        self.ocr_dpi = settings.ocr_dpi or 300
+        self.ocr_dpi = settings.ocr_dpi or 200
         self._ocr_scale = max(self.ocr_dpi / 72.0, 1.0)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Several extraction threads may need the pool at once; only one may create it.
+        self._executor_lock = threading.Lock()
+        self._lid = None
+        if settings.language_detection == "fasttext":
+            model_path = Path(settings.language_model_path).expanduser()
+            try:
+                self._lid = fasttext.load_model(str(model_path))
+            except Exception as exc:
+                logger.warning("Failed to load fastText model {}: {}; using langdetect", model_path, exc)
 
     def _detect_language(self, text: str) -> Optional[str]:
         snippet = text.strip().replace("\n", " ")
@@ -59,30 +89,84 @@ class TextExtractor:
         except Exception:
             return None
 
-    def _run_ocr(self, image, pdf_path: Path, page_number: int) -> str:
-        text = ""
+    def _detect_languages(self, texts: Sequence[str]) -> List[Optional[str]]:
+        """Detect languages for many texts, batching through fastText when available.
+
+        Mono-script pages are classified from their characters alone; only mixed
+        content reaches the model.
+        """
+        languages: List[Optional[str]] = [None] * len(texts)
+        pending: List[int] = []
+        for idx, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            language = _script_language(text.strip())
+            if language:
+                languages[idx] = language
+            else:
+                pending.append(idx)
+        if not pending:
+            return languages
+
+        if self._lid is None:
+            for idx in pending:
+                languages[idx] = self._detect_language(texts[idx])
+            return languages
+
+        snippets = [texts[idx].strip().replace("\n", " ")[:512] for idx in pending]
+        labels, _ = self._lid.predict(snippets, k=1)
+        for idx, label in zip(pending, labels):
+            languages[idx] = label[0].removeprefix("__label__")
+        return languages
+
+    def _assign_languages(self, blocks: List[PageBlock]) -> None:
+        for block, language in zip(blocks, self._detect_languages([block.text for block in blocks])):
+            block.language = language
+
+    def _ocr_pool(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                workers = self.settings.ocr_workers or max(1, (os.cpu_count() or 1) // 4)
+                logger.info("Starting OCR pool with {} workers", workers)
+                # Parallelism comes from the pool; stop each worker's Tesseract from spawning
+                # its own OpenMP threads. Must be in the environment before workers start.
+                os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+                # Never fork a process that may be running torch on the translator thread.
+                methods = multiprocessing.get_all_start_methods()
+                method = "forkserver" if "forkserver" in methods else "spawn"
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context(method),
+                    initializer=init_ocr_worker,
+                    initargs=(self.ocr_languages, self.settings.ocr_psm, self.settings.ocr_oem),
+                )
+            return self._executor
+
+    def _reset_ocr_pool(self, pool: ProcessPoolExecutor) -> None:
+        """Drop `pool` if it is still current, so the next document starts a fresh one."""
+        with self._executor_lock:
+            if self._executor is pool:
+                self._executor = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _ocr_pages(
+        self, pdf_path: Path, indices: Sequence[int]
+    ) -> Iterator[Tuple[int, Optional[str]]]:
+        """OCR the given zero-based page indices, yielding results in order."""
+        pool = self._ocr_pool()
+        tasks = [(str(pdf_path), index, self._ocr_scale) for index in indices]
         try:
-            text = pytesseract.image_to_string(image, lang=self.ocr_languages)
-        except pytesseract.TesseractError as exc:
-            logger.error("OCR failed on %s page %s: %s", pdf_path, page_number, exc)
-            if "Failed loading language" in str(exc) and "hin" in self.ocr_languages:
-                try:
-                    text = pytesseract.image_to_string(image, lang="eng")
-                except pytesseract.TesseractError as inner_exc:
-                    logger.error(
-                        "English-only OCR fallback failed on %s page %s: %s",
-                        pdf_path,
-                        page_number,
-                        inner_exc,
-                    )
-                    text = ""
-        finally:
-            try:
-                image.close()
-            except Exception:
-                pass
+            yield from zip(indices, pool.map(render_and_ocr, tasks, chunksize=2))
+        except Exception:
+            self._reset_ocr_pool(pool)
+            raise
 
-        return text.replace("\x0c", "").strip()
+    def close(self) -> None:
+        """Shut down the OCR worker pool, if one was started."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
 
     def _extract_with_ocr(self, pdf_path: Path) -> DocumentExtraction:
         logger.info("Extracting (OCR) text from %s", pdf_path)
@@ -95,37 +179,19 @@ class TextExtractor:
             return DocumentExtraction(source_path=pdf_path, blocks=blocks)
 
         total_pages = len(document)
+        document.close()
         if total_pages == 0:
             logger.warning("No pages detected in %s", pdf_path)
-            document.close()
             return DocumentExtraction(source_path=pdf_path, blocks=blocks)
 
         if self.settings.max_pages:
             total_pages = min(total_pages, self.settings.max_pages)
 
-        for index in range(total_pages):
-            page_number = index + 1
-            try:
-                page = document.get_page(index)
-            except Exception as exc:
-                logger.error("Unable to access page {} of {}: {}", page_number, pdf_path, exc)
-                continue
-
-            try:
-                bitmap = page.render(scale=self._ocr_scale)
-                pil_image = bitmap.to_pil()
-            except Exception as exc:
-                logger.error("Rendering failed for {} page {}: {}", pdf_path, page_number, exc)
-                page.close()
+        for index, text in self._ocr_pages(pdf_path, range(total_pages)):
+            if text is None:
                 continue
+            blocks.append(PageBlock(page_number=index + 1, text=text))
 
-            text = self._run_ocr(pil_image, pdf_path, page_number)
-            bitmap.close()
-            language = self._detect_language(text) if text else None
-            blocks.append(PageBlock(page_number=page_number, text=text, language=language))
-            page.close()
-
-        document.close()
         return DocumentExtraction(source_path=pdf_path, blocks=blocks)
 
     def _extract_with_pdfplumber(self, pdf_path: Path) -> DocumentExtraction:
@@ -134,13 +200,40 @@ class TextExtractor:
         with pdfplumber.open(pdf_path) as pdf:
             for page_idx, page in enumerate(pdf.pages, start=1):
                 text = page.extract_text() or ""
-                language = self._detect_language(text) if text else None
-                blocks.append(PageBlock(page_number=page_idx, text=text, language=language))
+                blocks.append(PageBlock(page_number=page_idx, text=text))
                 if self.settings.max_pages and page_idx >= self.settings.max_pages:
                     break
         return DocumentExtraction(source_path=pdf_path, blocks=blocks)
 
     def extract(self, pdf_path: Path) -> DocumentExtraction:
+        """Read the PDF text layer, falling back to OCR for pages without usable text."""
+        try:
+            extraction = self._extract_with_pdfplumber(pdf_path)
+        except Exception as exc:
+            if not self.settings.enable_ocr:
+                raise
+            logger.error("Native text extraction failed for {}: {}; using OCR", pdf_path, exc)
+            extraction = self._extract_with_ocr(pdf_path)
+            self._assign_languages(extraction.blocks)
+            return extraction
+
+        blocks = extraction.blocks
         if self.settings.enable_ocr:
-            return self._extract_with_ocr(pdf_path)
-        return self._extract_with_pdfplumber(pdf_path)
+            min_chars = self.settings.min_chars_for_text_layer
+            empty_indices = [
+                idx for idx, block in enumerate(blocks) if len(block.text.strip()) < min_chars
+            ]
+            if empty_indices:
+                logger.info(
+                    "Running OCR on {} of {} pages in {}", len(empty_indices), len(blocks), pdf_path
+                )
+                try:
+                    for index, text in self._ocr_pages(pdf_path, empty_indices):
+                        if text:
+                            blocks[index].text = text
+                except Exception as exc:
+                    # Keep the text layer; a broken pool is rebuilt for the next document.
+                    logger.error("OCR failed for {}: {}; keeping native text", pdf_path, exc)
+
+        self._assign_languages(blocks)
+        return extraction
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
-import re
+import hashlib
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 import torch
+import torch.nn.functional as F
 from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
 
 from ..config.models import ProcessingSettings
+from ..utils.io import chunked
 from ..utils.logging import get_logger
+from ..utils.threads import configure_torch_threads
 from .text_extraction import PageBlock
 
 logger = get_logger(__name__)
 
-DEVANAGARI_RE = re.compile(r"[\u0900-\u097F]")
+# Allow TF32 tensor cores for any remaining float32 matmuls on CUDA.
+torch.set_float32_matmul_precision("high")
+
 
 # Mapping from language detection outputs to IndicTrans2 language tags.
 INDIC_LANGUAGE_TAGS = {
@@ -56,6 +63,12 @@ INDIC_LANGUAGE_TAGS = {
     "en": "eng_Latn",
 }
 
+# Encoder input lengths are padded up to these sizes to bound recompilation when the
+# model is compiled; decoder shapes still vary per step.
+SHAPE_BUCKETS = (64, 128, 256, 512)
+
+_DTYPES = {"float32": torch.float32, "float16": torch.float16, "bfloat16": torch.bfloat16}
+
 DEFAULT_SOURCE_TAG = "hin_Deva"
 TARGET_LANGUAGE_TAG = "eng_Latn"
 
@@ -73,11 +86,21 @@ class TranslationService:
     def __init__(self, settings: ProcessingSettings) -> None:
         self.settings = settings
         self._model: Optional[AutoModelForSeq2SeqLM] = None
+        self._ct2_translator = None
         self._tokenizer: Optional[AutoTokenizer] = None
         self._device = self._resolve_device(settings.device_preference)
+        self._dtype = self._resolve_dtype(settings.translation_dtype)
         self._available = False
         self._attempted = False
         self._target_prefix = TARGET_LANGUAGE_TAG
+        self._use_cache = True
+        self._static_shapes = False
+        # Uncompiled forward, kept so a failing compiled graph can be swapped back out.
+        self._eager_forward = None
+        # Recently translated chunks keyed on (source tag, content hash), oldest first.
+        self._translations: "OrderedDict[Tuple[str, bytes], str]" = OrderedDict()
+        if self._device.type == "cpu":
+            configure_torch_threads()
 
     def _resolve_device(self, preference: str) -> torch.device:
         if preference == "mps" and getattr(torch.backends, "mps", None) and torch.backends.mps.is_available():
@@ -86,6 +109,100 @@ class TranslationService:
             return torch.device("cuda")
         return torch.device("cpu")
 
+    def _resolve_dtype(self, preference: str) -> torch.dtype:
+        if preference != "auto":
+            if preference not in _DTYPES:
+                raise ValueError(
+                    f"processing.translation_dtype must be 'auto' or one of {sorted(_DTYPES)}, "
+                    f"got {preference!r}"
+                )
+            return _DTYPES[preference]
+        # Half precision halves memory traffic on accelerators; CPUs without native
+        # bf16 support run slower in it, so they stay in float32 unless configured.
+        # MPS gets float16 too: bfloat16 there needs macOS 14+.
+        if self._device.type in ("cuda", "mps"):
+            return torch.float16
+        return torch.float32
+
+    def _from_pretrained(self, model_name: str) -> AutoModelForSeq2SeqLM:
+        kwargs = dict(trust_remote_code=True, torch_dtype=self._dtype, low_cpu_mem_usage=True)
+        try:
+            # Fused scaled-dot-product attention picks FlashAttention-style kernels where available.
+            return AutoModelForSeq2SeqLM.from_pretrained(model_name, attn_implementation="sdpa", **kwargs)
+        except (ImportError, TypeError, ValueError) as exc:
+            logger.info("SDPA attention unavailable for {} ({}); using default attention", model_name, exc)
+            return AutoModelForSeq2SeqLM.from_pretrained(model_name, **kwargs)
+
+    def _load_backend(self, model_name: str) -> None:
+        backend = self.settings.translation_backend
+        if backend == "ctranslate2":
+            try:
+                self._ct2_translator = self._load_ctranslate2()
+                return
+            except Exception as exc:
+                logger.warning("CTranslate2 backend unavailable ({}); using transformers", exc)
+        elif backend == "onnx":
+            try:
+                self._model = self._load_onnx()
+                return
+            except Exception as exc:
+                logger.warning("ONNX Runtime backend unavailable ({}); using transformers", exc)
+
+        try:
+            self._model = self._from_pretrained(model_name).to(self._device).eval()
+        except Exception as exc:
+            if self._dtype == torch.float32:
+                raise
+            # Not every device/OS combination supports every half-precision dtype.
+            logger.warning("Loading in {} failed ({}); retrying in float32", self._dtype, exc)
+            self._dtype = torch.float32
+            self._model = self._from_pretrained(model_name).to(self._device).eval()
+        if self.settings.translation_quantize and self._device.type == "cpu":
+            self._model = self._quantize(self._model)
+        if self.settings.translation_compile and self._device.type == "cuda":
+            # MPS/CPU gains are marginal. CUDA graphs ("reduce-overhead") are avoided because
+            # the decoder's KV-cache shapes change on every generation step.
+            self._eager_forward = self._model.forward
+            self._model.forward = torch.compile(self._model.forward, fullgraph=False)
+            self._static_shapes = True
+        self._model.config.use_cache = True
+
+    def _quantize(self, model: AutoModelForSeq2SeqLM) -> AutoModelForSeq2SeqLM:
+        if self._dtype != torch.float32:
+            logger.info("Skipping int8 quantisation for a {} model", self._dtype)
+            return model
+        try:
+            return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        except Exception as exc:
+            logger.warning("Dynamic quantisation failed ({}); keeping the float32 model", exc)
+            return model
+
+    def _load_ctranslate2(self):
+        import ctranslate2
+
+        model_dir = self.settings.translation_ct2_model
+        if not model_dir:
+            raise ValueError("processing.translation_ct2_model is not set")
+        on_cuda = self._device.type == "cuda"
+        return ctranslate2.Translator(
+            model_dir,
+            device="cuda" if on_cuda else "cpu",
+            compute_type="int8_float16" if on_cuda else "int8",
+        )
+
+    def _load_onnx(self):
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+        model_dir = self.settings.translation_onnx_model
+        if not model_dir:
+            raise ValueError("processing.translation_onnx_model is not set")
+        provider = "CUDAExecutionProvider" if self._device.type == "cuda" else "CPUExecutionProvider"
+        # Load a pre-exported directory; IndicTrans2 has no built-in export config, and
+        # exporting on every run would dwarf any inference savings anyway.
+        return ORTModelForSeq2SeqLM.from_pretrained(
+            model_dir, export=False, provider=provider, trust_remote_code=True
+        )
+
     def _load_model(self) -> bool:
         if self._available:
             return True
@@ -97,11 +214,9 @@ class TranslationService:
             return False
 
         try:
-            logger.info("Loading translation model %s on %s", model_name, self._device)
+            logger.info("Loading translation model {} on {} ({})", model_name, self._device, self._dtype)
             self._tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
-            self._model = AutoModelForSeq2SeqLM.from_pretrained(model_name, trust_remote_code=True).to(
-                self._device
-            )
+            self._load_backend(model_name)
             self._available = True
         except Exception as exc:
             logger.warning("Failed to load translation model %s: %s", model_name, exc)
@@ -110,131 +225,266 @@ class TranslationService:
             self._attempted = True
         return self._available
 
-    def _segment_text(self, text: str) -> List[Tuple[bool, str]]:
-        segments: List[Tuple[bool, str]] = []
-        buffer: List[str] = []
-        current_flag: Optional[bool] = None
-
-        for line in text.splitlines():
-            has_devanagari = bool(DEVANAGARI_RE.search(line))
-            if current_flag is None:
-                current_flag = has_devanagari
-            if has_devanagari == current_flag:
-                buffer.append(line)
-            else:
-                segments.append((current_flag, "\n".join(buffer)))
-                buffer = [line]
-                current_flag = has_devanagari
-        if buffer:
-            segments.append((current_flag, "\n".join(buffer)))
-        return segments
+    def _scan_devanagari(self, text: str) -> Tuple[List[str], np.ndarray]:
+        """Split `text` into lines and flag the ones containing Devanagari in one vectorised pass."""
+        lines = text.splitlines()
+        if not lines:
+            return lines, np.zeros(0, dtype=bool)
+
+        joined = "\n".join(lines)
+        codepoints = np.frombuffer(joined.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        mask = (codepoints >= 0x0900) & (codepoints <= 0x097F)
+        # splitlines() removed every other line break, so "\n" marks exactly the line boundaries.
+        newlines = np.flatnonzero(codepoints == 0x0A)
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.concatenate((newlines, [len(codepoints)]))
+        counts = np.concatenate(([0], np.cumsum(mask)))
+        return lines, (counts[ends] - counts[starts]) > 0
+
+    def _segment_text(self, text: str) -> Tuple[List[Tuple[bool, str]], bool]:
+        """Split `text` into runs of Devanagari / non-Devanagari lines.
+
+        Also reports whether any Devanagari was seen; text without any is not segmented.
+        """
+        lines, flags = self._scan_devanagari(text)
+        if not flags.any():
+            return [], False
+        boundaries = [0, *(np.flatnonzero(flags[1:] != flags[:-1]) + 1).tolist(), len(lines)]
+        segments = [
+            (bool(flags[start]), "\n".join(lines[start:end]))
+            for start, end in zip(boundaries, boundaries[1:])
+        ]
+        return segments, True
 
     def _chunk_text(self, text: str, max_chars: int = 512) -> List[str]:
+        """Group the lines of a segment into chunks of roughly `max_chars`, as slices of `text`.
+
+        Segments are "\n"-joined by `_segment_text`, so scanning for "\n" alone sees the
+        same lines as `splitlines()`.
+        """
+        if not text:
+            return []
+        if text.endswith("\n"):
+            # splitlines() does not yield an empty line after a trailing break.
+            text = text[:-1]
+
         chunks: List[str] = []
-        current: List[str] = []
+        chunk_start = 0
         current_len = 0
-
-        for line in text.splitlines():
-            line_len = len(line)
-            if current and current_len + line_len + 1 > max_chars:
-                chunks.append("\n".join(current))
-                current = [line]
+        pos = 0
+        while True:
+            newline = text.find("\n", pos)
+            line_end = newline if newline != -1 else len(text)
+            line_len = line_end - pos
+            if pos > chunk_start and current_len + line_len + 1 > max_chars:
+                chunks.append(text[chunk_start : pos - 1])
+                chunk_start = pos
                 current_len = line_len
             else:
-                current.append(line)
                 current_len += line_len + 1
+            if newline == -1:
+                break
+            pos = newline + 1
 
-        if current:
-            chunks.append("\n".join(current))
+        chunks.append(text[chunk_start:])
         return chunks
 
-    def _batch_chunks(self, chunks: List[str], size: int = 4) -> Iterable[List[str]]:
-        for idx in range(0, len(chunks), size):
-            yield chunks[idx : idx + size]
-
     def _lang_tag(self, language: Optional[str]) -> str:
         if not language:
             return DEFAULT_SOURCE_TAG
 
         normalised = language.lower().split("-", 1)[0]
-        candidates = [
-            normalised,
-            normalised[:3] if len(normalised) >= 3 else normalised,
-            normalised[:2] if len(normalised) >= 2 else normalised,
+        return (
+            INDIC_LANGUAGE_TAGS.get(normalised)
+            or INDIC_LANGUAGE_TAGS.get(normalised[:3])
+            or INDIC_LANGUAGE_TAGS.get(normalised[:2])
+            or DEFAULT_SOURCE_TAG
+        )
+
+    def _translate_batch_ct2(self, batch_ids: List[List[int]]) -> List[str]:
+        assert self._tokenizer is not None and self._ct2_translator is not None  # for mypy
+        tokens = [self._tokenizer.convert_ids_to_tokens(ids) for ids in batch_ids]
+        results = self._ct2_translator.translate_batch(tokens, max_decoding_length=256, beam_size=1)
+        return [
+            self._tokenizer.decode(
+                self._tokenizer.convert_tokens_to_ids(result.hypotheses[0]), skip_special_tokens=True
+            )
+            for result in results
         ]
 
-        for candidate in candidates:
-            if candidate and candidate in INDIC_LANGUAGE_TAGS:
-                return INDIC_LANGUAGE_TAGS[candidate]
-        return DEFAULT_SOURCE_TAG
-
-    def _translate_chunks(self, chunks: List[str], src_tag: str) -> List[str]:
-        if not self._load_model():
-            return chunks
+    def _translate_batch(self, batch_ids: List[List[int]]) -> List[str]:
+        """Translate one mini-batch of pre-tokenized inputs."""
+        if self._ct2_translator is not None:
+            return self._translate_batch_ct2(batch_ids)
         assert self._tokenizer is not None and self._model is not None  # for mypy
-
-        prefixed_inputs = [
-            f"{src_tag} {self._target_prefix} {chunk.strip()}" for chunk in chunks if chunk.strip()
-        ]
-        if not prefixed_inputs:
-            return [""] * len(chunks)
-
-        translations: List[str] = []
         with torch.inference_mode():
-            tokenized = self._tokenizer(
-                prefixed_inputs,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-                max_length=512,
-            )
-            tokenized = {key: value.to(self._device) for key, value in tokenized.items()}
-            generated = self._model.generate(**tokenized, max_new_tokens=256, use_cache=False)
+            tokenized = self._tokenizer.pad({"input_ids": batch_ids}, padding=True, return_tensors="pt")
+            if self._static_shapes:
+                tokenized = self._pad_to_bucket(tokenized)
+            if self._device.type == "cuda":
+                # Pinned host buffers let the copy run asynchronously with queued kernels.
+                tokenized = {
+                    key: value.pin_memory().to(self._device, non_blocking=True)
+                    for key, value in tokenized.items()
+                }
+            else:
+                tokenized = {key: value.to(self._device) for key, value in tokenized.items()}
+            generated = self._generate(tokenized)
             decoded = self._tokenizer.batch_decode(generated, skip_special_tokens=True)
-            translations.extend(decoded)
-
-        iterator = iter(translations)
-        results: List[str] = []
-        for chunk in chunks:
-            if chunk.strip():
-                results.append(next(iterator, ""))
+            del generated, tokenized
+            return decoded
+
+    def _pad_to_bucket(self, tokenized: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        assert self._tokenizer is not None  # for mypy
+        length = tokenized["input_ids"].shape[1]
+        target = next((bucket for bucket in SHAPE_BUCKETS if bucket >= length), length)
+        if target == length:
+            return tokenized
+        padded: Dict[str, torch.Tensor] = {}
+        for key, value in tokenized.items():
+            fill = self._tokenizer.pad_token_id if key == "input_ids" else 0
+            padded[key] = F.pad(value, (0, target - length), value=fill)
+        return padded
+
+    def _generate(self, tokenized: Dict[str, torch.Tensor]) -> torch.Tensor:
+        if self._eager_forward is None:
+            return self._generate_once(tokenized)
+        try:
+            return self._generate_once(tokenized)
+        except Exception as exc:
+            # Dynamo/Inductor failures surface inside generate; fall back to eager for good.
+            logger.warning("Compiled translation model failed ({}); reverting to eager mode", exc)
+            assert self._model is not None  # for mypy
+            self._model.forward = self._eager_forward
+            self._eager_forward = None
+            self._static_shapes = False
+            return self._generate_once(tokenized)
+
+    def _generate_once(self, tokenized: Dict[str, torch.Tensor]) -> torch.Tensor:
+        assert self._tokenizer is not None and self._model is not None  # for mypy
+        kwargs = dict(
+            max_new_tokens=256,
+            num_beams=1,
+            do_sample=False,
+            pad_token_id=self._tokenizer.pad_token_id,
+        )
+        if self._use_cache:
+            try:
+                return self._model.generate(**tokenized, use_cache=True, **kwargs)
+            except (AttributeError, TypeError, ValueError) as exc:
+                # Some trust_remote_code checkpoints break on cached decoding; disable it once.
+                logger.warning("Cached decoding failed ({}); retrying without KV cache", exc)
+                self._use_cache = False
+                self._model.config.use_cache = False
+        return self._model.generate(**tokenized, use_cache=False, **kwargs)
+
+    def _remember(self, key: Tuple[str, bytes], translation: str) -> None:
+        limit = self.settings.translation_cache_size
+        if limit <= 0:
+            return
+        self._translations[key] = translation
+        self._translations.move_to_end(key)
+        while len(self._translations) > limit:
+            self._translations.popitem(last=False)
+
+    def _translate_many(self, chunks: Sequence[str], src_tag: str) -> List[str]:
+        """Translate chunks sharing a source tag in length-sorted batches, preserving order.
+
+        Repeated chunks (headers, standard motions) are served from an LRU cache and
+        translated at most once per call.
+        """
+        outputs = [""] * len(chunks)
+        missing: Dict[Tuple[str, bytes], List[int]] = {}
+        for idx, chunk in enumerate(chunks):
+            text = chunk.strip()
+            if not text:
+                continue
+            key = (src_tag, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest())
+            cached = self._translations.get(key)
+            if cached is not None:
+                self._translations.move_to_end(key)
+                outputs[idx] = cached
             else:
-                results.append("")
-        return results
+                missing.setdefault(key, []).append(idx)
+        if not missing:
+            return outputs
 
-    def translate_text(self, text: str, source_language: Optional[str] = None) -> str:
-        if not text.strip():
-            return text
-        if not DEVANAGARI_RE.search(text):
-            return text
-
-        translated_segments: List[str] = []
-        src_tag = self._lang_tag(source_language)
-        for is_devanagari, segment in self._segment_text(text):
-            if not segment.strip():
-                translated_segments.append(segment)
+        if not self._load_model():
+            return list(chunks)
+        assert self._tokenizer is not None  # for mypy
+
+        keys = list(missing)
+        # One call through the fast tokenizer's batch path; padding happens per mini-batch.
+        input_ids = self._tokenizer(
+            [f"{src_tag} {self._target_prefix} {chunks[missing[key][0]].strip()}" for key in keys],
+            padding=False,
+            truncation=True,
+            max_length=512,
+            return_attention_mask=False,
+        )["input_ids"]
+        # Batches of similar token length keep padding per batch small.
+        order = sorted(range(len(input_ids)), key=lambda pos: len(input_ids[pos]))
+        for batch in chunked(order, self.settings.translation_batch_size):
+            decoded = self._translate_batch([input_ids[pos] for pos in batch])
+            for pos, translation in zip(batch, decoded):
+                self._remember(keys[pos], translation)
+                for idx in missing[keys[pos]]:
+                    outputs[idx] = translation
+        return outputs
+
+    def _translate_texts(self, items: Sequence[Tuple[str, Optional[str]]]) -> List[str]:
+        """Translate many `(text, language)` pairs with one batched model pass per source tag."""
+        results = [text for text, _ in items]
+        plans: Dict[int, List[Tuple[bool, str, int, int]]] = {}
+        pending: Dict[str, List[str]] = {}
+
+        # Pass 1: segment every text, queueing Devanagari chunks by source tag.
+        for item_idx, (text, language) in enumerate(items):
+            if not text.strip():
                 continue
-            if not is_devanagari:
-                translated_segments.append(segment)
+            segments, had_devanagari = self._segment_text(text)
+            if not had_devanagari:
                 continue
+            src_tag = self._lang_tag(language)
+            queue = pending.setdefault(src_tag, [])
+            plan: List[Tuple[bool, str, int, int]] = []
+            for is_devanagari, segment in segments:
+                if not is_devanagari or not segment.strip():
+                    plan.append((False, segment, 0, 0))
+                    continue
+                chunks = self._chunk_text(segment)
+                plan.append((True, src_tag, len(queue), len(chunks)))
+                queue.extend(chunks)
+            plans[item_idx] = plan
+
+        # Pass 2: translate each source tag's chunks together.
+        translated = {tag: self._translate_many(chunks, tag) for tag, chunks in pending.items()}
+
+        # Pass 3: stitch translated chunks back into their texts.
+        for item_idx, plan in plans.items():
+            parts: List[str] = []
+            for is_translated, value, offset, count in plan:
+                if is_translated:
+                    parts.append("\n".join(translated[value][offset : offset + count]).strip())
+                else:
+                    parts.append(value)
+            results[item_idx] = "\n".join(parts).strip() or items[item_idx][0]
+        return results
 
-            chunks = self._chunk_text(segment)
-            translated_chunks: List[str] = []
-            for batch in self._batch_chunks(chunks):
-                translated_chunks.extend(self._translate_chunks(batch, src_tag))
-            translated_segments.append("\n".join(translated_chunks).strip())
-        return "\n".join(translated_segments).strip() or text
+    def translate_text(self, text: str, source_language: Optional[str] = None) -> str:
+        return self._translate_texts([(text, source_language)])[0]
 
     def translate_blocks(self, blocks: Iterable[PageBlock]) -> List[TranslatedBlock]:
-        translated: List[TranslatedBlock] = []
-        for block in blocks:
-            text = block.text or ""
-            translated_text = self.translate_text(text, block.language)
-            translated.append(
-                TranslatedBlock(
-                    page_number=block.page_number,
-                    source_language=block.language,
-                    translated_text=translated_text if translated_text else text,
-                )
+        blocks = list(blocks)
+        texts = self._translate_texts([(block.text or "", block.language) for block in blocks])
+        if self._available and self._device.type == "cuda":
+            # Hand cached blocks back between documents so other GPU users can claim them.
+            torch.cuda.empty_cache()
+        return [
+            TranslatedBlock(
+                page_number=block.page_number,
+                source_language=block.language,
+                translated_text=translated_text if translated_text else (block.text or ""),
             )
-        return translated
+            for block, translated_text in zip(blocks, texts)
+        ]
@@ -1,17 +1,61 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import tempfile
+import zipfile
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Sequence
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
 
 from ..config.models import TopicSettings
+from ..utils.io import ensure_directory
 from ..utils.logging import get_logger
+from ..utils.threads import configure_torch_threads
+
+try:
+    import faiss
+except ImportError:  # pragma: no cover - faiss is optional
+    faiss = None
 
 logger = get_logger(__name__)
 
+# Above this many documents sklearn falls back to mini-batch k-means.
+MINIBATCH_THRESHOLD = 10_000
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _load_npz(path: Path) -> Optional[Dict[str, np.ndarray]]:
+    if not path.exists():
+        return None
+    try:
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+    except (OSError, ValueError, zipfile.BadZipFile) as exc:
+        logger.warning("Ignoring unreadable topic cache {}: {}", path, exc)
+        return None
+
+
+def _save_npz(path: Path, **arrays: np.ndarray) -> None:
+    """Write `arrays` to `path` atomically so an interrupted run never leaves a torn cache."""
+    ensure_directory(path.parent)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            np.savez(fh, **arrays)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
 
 @dataclass
 class TopicAssignment:
@@ -24,44 +68,126 @@ class TopicAssignment:
 class TopicModel:
     """Simple topic discovery using embeddings + KMeans (placeholder for BERTopic)."""
 
-    def __init__(self, settings: TopicSettings) -> None:
+    def __init__(self, settings: TopicSettings, cache_dir: Optional[Path] = None) -> None:
         self.settings = settings
         self._encoder: Optional[SentenceTransformer] = None
         self._labels: Dict[int, str] = {}
+        # Embeddings and cluster results are keyed on the embedding model so switching models
+        # never mixes vector spaces.
+        self._cache_dir = cache_dir
+        self._model_key = _digest(settings.embedding_model.encode("utf-8")).hex()[:16]
 
     def _load_encoder(self) -> None:
         if self._encoder is None:
             logger.info("Loading topic embedding model %s", self.settings.embedding_model)
             self._encoder = SentenceTransformer(self.settings.embedding_model)
+            self._encoder.eval()
+            if self._encoder.device.type == "cpu":
+                configure_torch_threads()
 
-    def fit(self, documents: Sequence[str]) -> List[TopicAssignment]:
+    def _cluster(self, embeddings: np.ndarray, clusters: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Cluster `embeddings`, returning per-document topic ids and the centroids."""
+        if faiss is not None:
+            kmeans = faiss.Kmeans(
+                embeddings.shape[1], clusters, niter=20, nredo=1, gpu=faiss.get_num_gpus() > 0
+            )
+            kmeans.train(embeddings)
+            _, topic_ids = kmeans.index.search(embeddings, 1)
+            return topic_ids.ravel().astype(np.int64), kmeans.centroids
+
+        if len(embeddings) > MINIBATCH_THRESHOLD:
+            model = MiniBatchKMeans(n_clusters=clusters, batch_size=4096, n_init="auto")
+        else:
+            model = KMeans(n_clusters=clusters, n_init="auto")
+        topic_ids = model.fit_predict(embeddings)
+        return topic_ids, model.cluster_centers_
+
+    def _encode(self, documents: Sequence[str]) -> np.ndarray:
         self._load_encoder()
         assert self._encoder is not None
+        with torch.inference_mode():
+            return self._encoder.encode(
+                documents,
+                batch_size=64,
+                show_progress_bar=True,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            ).astype(np.float32, copy=False)
+
+    def _embed(self, documents: Sequence[str], doc_hashes: np.ndarray) -> np.ndarray:
+        """Embed `documents`, encoding only those missing from the on-disk cache."""
+        if self._cache_dir is None:
+            return self._encode(documents)
+
+        path = self._cache_dir / f"embeddings-{self._model_key}.npz"
+        cached = _load_npz(path)
+        if cached is not None and {"hashes", "embeddings"} <= cached.keys():
+            known_hashes, known = cached["hashes"], cached["embeddings"]
+        else:
+            known_hashes = np.empty(0, dtype="S16")
+            known = np.empty((0, 0), dtype=np.float32)
+        rows = {digest: row for row, digest in enumerate(known_hashes.tolist())}
+
+        # First occurrence of each uncached document; duplicates share one embedding.
+        missing: Dict[bytes, int] = {}
+        for idx, digest in enumerate(doc_hashes.tolist()):
+            if digest not in rows:
+                missing.setdefault(digest, idx)
+        if missing:
+            logger.info("Encoding {} of {} documents not in the embedding cache", len(missing), len(documents))
+            fresh = self._encode([documents[idx] for idx in missing.values()])
+            if known.size == 0:
+                known = np.empty((0, fresh.shape[1]), dtype=np.float32)
+            for offset, digest in enumerate(missing):
+                rows[digest] = len(known_hashes) + offset
+            known_hashes = np.concatenate([known_hashes, doc_hashes[list(missing.values())]])
+            known = np.concatenate([known, fresh])
+            _save_npz(path, hashes=known_hashes, embeddings=known)
+        return known[[rows[digest] for digest in doc_hashes.tolist()]]
 
-        embeddings = self._encoder.encode(documents, show_progress_bar=True)
+    def _cluster_cached(
+        self, embeddings: np.ndarray, doc_hashes: np.ndarray, clusters: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Reuse the last clustering when the corpus and topic count are unchanged."""
+        if self._cache_dir is None:
+            return self._cluster(embeddings, clusters)
+
+        path = self._cache_dir / f"clusters-{self._model_key}.npz"
+        corpus_key = np.frombuffer(_digest(doc_hashes.tobytes() + str(clusters).encode()), dtype=np.uint8)
+        cached = _load_npz(path)
+        if cached is not None and np.array_equal(cached.get("corpus_key"), corpus_key):
+            logger.info("Reusing cached topic clusters for {} documents", len(doc_hashes))
+            return cached["topic_ids"], cached["centroids"]
+
+        topic_ids, centroids = self._cluster(embeddings, clusters)
+        _save_npz(path, corpus_key=corpus_key, topic_ids=topic_ids, centroids=centroids)
+        return topic_ids, centroids
+
+    def fit(self, documents: Sequence[str]) -> List[TopicAssignment]:
+        doc_hashes = np.array([_digest(doc.encode("utf-8")) for doc in documents], dtype="S16")
+        embeddings = self._embed(documents, doc_hashes)
         clusters = max(1, min(self.settings.target_topics, len(documents)))
-        kmeans = KMeans(n_clusters=clusters, n_init="auto")
-        topic_ids = kmeans.fit_predict(embeddings)
+        topic_ids, centroids = self._cluster_cached(np.ascontiguousarray(embeddings), doc_hashes, clusters)
 
-        assignments: Dict[int, List[str]] = {}
-        for topic_id, text in zip(topic_ids, documents):
-            assignments.setdefault(topic_id, []).append(text)
+        # Embeddings are unit length, so cosine similarity to the normalised centroids is a dot product.
+        centroids = centroids.astype(np.float32)
+        centroids /= np.linalg.norm(centroids, axis=1, keepdims=True) + 1e-9
+        all_similarities = embeddings @ centroids.T
 
         results: List[TopicAssignment] = []
-        for topic_id, texts in assignments.items():
-            centroid = kmeans.cluster_centers_[topic_id]
-            scores = self._encoder.encode(texts, convert_to_numpy=True)
-            denom = (np.linalg.norm(scores, axis=1) * np.linalg.norm(centroid) + 1e-9)
-            similarities = (scores @ centroid) / denom
-            topic_idx = int(topic_id)
-            label = self._labels.get(topic_idx, f"Topic {topic_idx}")
-            top_indices = np.argsort(similarities)[::-1][:5]
+        for topic_id in dict.fromkeys(topic_ids.tolist()):
+            members = np.flatnonzero(topic_ids == topic_id)
+            similarities = all_similarities[members, topic_id]
+            label = self._labels.get(topic_id, f"Topic {topic_id}")
+            top_k = min(5, similarities.size)
+            top_indices = np.argpartition(-similarities, top_k - 1)[:top_k]
+            top_indices = top_indices[np.argsort(-similarities[top_indices])]
             results.append(
                 TopicAssignment(
-                    topic_id=topic_idx,
+                    topic_id=topic_id,
                     label=label,
                     score=float(similarities[top_indices[0]]),
-                    sentences=[texts[idx] for idx in top_indices],
+                    sentences=[documents[members[idx]] for idx in top_indices],
                 )
             )
         return results
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, Iterator
+from typing import Any, Iterable, Iterator
+
+import orjson
 
 
 def ensure_directory(path: Path) -> Path:
@@ -12,11 +15,22 @@ def ensure_directory(path: Path) -> Path:
 
 def chunked(iterable: Iterable, size: int) -> Iterator[list]:
     """Yield lists of length `size` from `iterable`."""
-    chunk = []
-    for item in iterable:
-        chunk.append(item)
-        if len(chunk) == size:
-            yield chunk
-            chunk = []
-    if chunk:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
         yield chunk
+
+
+def write_json_array(path: Path, items: Iterable[Any]) -> int:
+    """Stream `items` to `path` as a JSON array, one element per line; return the count."""
+    count = 0
+    with path.open("wb") as fh:
+        fh.write(b"[")
+        for item in items:
+            fh.write(b",\n  " if count else b"\n  ")
+            fh.write(orjson.dumps(item))
+            count += 1
+        fh.write(b"\n]\n" if count else b"]\n")
+    return count
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -25,6 +26,7 @@ def configure_logging(log_dir: Optional[str] = None) -> None:
     _configured = True
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: str):
     """Return a child logger with consistent formatting."""
     return logger.bind(module=name)
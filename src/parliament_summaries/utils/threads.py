@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+
+import torch
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+THREADS_ENV_VAR = "PARLIAMENT_TORCH_THREADS"
+
+_configured = False
+
+
+def _available_cpus() -> int:
+    # Respect CPU affinity (containers, taskset) where the platform exposes it.
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def configure_torch_threads() -> None:
+    """Size PyTorch's CPU thread pools once per process.
+
+    Uses `PARLIAMENT_TORCH_THREADS` when set, otherwise every core this process may run on.
+    """
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    try:
+        threads = int(os.environ.get(THREADS_ENV_VAR) or _available_cpus())
+    except ValueError:
+        logger.warning("Ignoring invalid {}={!r}", THREADS_ENV_VAR, os.environ[THREADS_ENV_VAR])
+        threads = _available_cpus()
+    threads = max(1, threads)
+
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(max(1, threads // 2))
+    except RuntimeError:
+        # Only allowed before the first inter-op parallel work has started.
+        pass
+    logger.debug("Using {} intra-op threads for PyTorch", threads)